@@ -1,5 +1,6 @@
 #!/usr/bin/env -S uv run
 # /// script
+# requires-python = ">=3.11"
 # dependencies = ["tomlkit==0.13.*", "markdown-it-py>=3,<4"]
 # ///
 """Synchronize workspace and crate versions.
@@ -16,35 +17,118 @@ Run with the desired semantic version:
 """
 from __future__ import annotations
 
+import enum
+import fnmatch
 import os
 import re
+import stat
 import sys
-import tempfile
+import threading
+import tomllib
 from collections.abc import Mapping, MutableMapping
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
 from typing import Callable
 
 import tomlkit
 from markdown_it import MarkdownIt
 from tomlkit.exceptions import TOMLKitError
 
+# Serialises diagnostics from member worker threads so lines never interleave.
+_STDERR_LOCK = threading.Lock()
+
+# Building the CommonMark rule chains is comparatively expensive, so share a
+# single parser across every ``replace_fences`` call. Fences are block-level
+# tokens, so the inline pass (and the text joining that follows it) is
+# disabled; block structure is still parsed in full so fences nested in lists
+# or block quotes are found exactly as CommonMark defines them. markdown-it
+# compiles its rule caches lazily and without locking, so warm them here
+# before documents are parsed on worker threads.
+_MD_PARSER = MarkdownIt("commonmark").disable(["inline", "text_join"])
+_MD_PARSER.parse("warm-up")
+
+_GLOB_MAGIC = re.compile(r"[*?\[]")
+
+# Cheap stand-in for "could contain a TOML fence": any backtick or tilde fence
+# opener whose info string starts with ``toml``, allowing list and block quote
+# indentation before it.
+_TOML_FENCE_HINT_RE = re.compile(rb"^[ \t>]*(?:`{3,}|~{3,})[ \t]*toml", re.M | re.I)
+
+# Line breaks as markdown-it counts them when building ``Token.map``.
+_LINE_BREAK_RE = re.compile(r"\r\n?|\n")
+
+# Trailing newline runs that are carried over when a fence body or TOML
+# snippet is rewritten.
+_FENCE_TRAIL_NL_RE = re.compile(r"(\r?\n+)$")
+_SNIPPET_TRAIL_NL_RE = re.compile(r"((?:\r?\n)*)$")
+
+# ``[package]`` header plus the lines up to (but excluding) the next table.
+_PACKAGE_SECTION_RE = re.compile(
+    r"^[ \t]*\[package\][^\n]*\n((?:(?![ \t]*\[)[^\n]*(?:\n|$))*)", re.M
+)
+_WORKSPACE_PACKAGE_SECTION_RE = re.compile(
+    r"^[ \t]*\[workspace\.package\][^\n]*\n((?:(?![ \t]*\[)[^\n]*(?:\n|$))*)",
+    re.M,
+)
+_PACKAGE_NAME_RE = re.compile(r'^[ \t]*name[ \t]*=[ \t]*"([^"\n]*)"', re.M)
+_PACKAGE_VERSION_RE = re.compile(
+    r'^([ \t]*version[ \t]*=[ \t]*")[^"\n]*(")', re.M
+)
+
+# Packages whose manifest pins a sibling crate that must move in lockstep.
+_DEPENDENCY_SYNC = {"ortho_config": "ortho_config_macros"}
+
+_DEPENDENCY_TABLES = ("dependencies", "dev-dependencies", "build-dependencies")
+_TABLE_HEADER_RE = re.compile(r"^[ \t]*\[\[?[ \t]*([^\]\n]*?)[ \t]*\]", re.M)
+# Per spliceable dependency: its ``name = "..."`` or ``name = { ..., version =
+# "..." }`` entry on a single line, where group 1 ends after any caret or tilde
+# prefix; and any other mention of the name, which rules the splice out.
+_DEPENDENCY_SPLICE_RES = {
+    name: (
+        re.compile(
+            r"^([ \t]*" + re.escape(name) + r"[ \t]*=[ \t]*"
+            r'(?:\{[^}\n]*?\bversion[ \t]*=[ \t]*)?"[\^~]?)[^"\n]*(")',
+            re.M,
+        ),
+        re.compile(r"(?<![\w-])" + re.escape(name) + r"(?![\w-])"),
+    )
+    for name in ("ortho_config", *_DEPENDENCY_SYNC.values())
+}
+
+
+def _report(message: str) -> None:
+    """Write ``message`` to standard error as one uninterrupted line.
+
+    Examples
+    --------
+    >>> _report("Warning: example")
+    """
+    with _STDERR_LOCK:
+        print(message, file=sys.stderr)
+
 
 def _is_matching_fence_token(tok, lang: str) -> bool:
     """Return ``True`` if ``tok`` is a fence of ``lang``.
 
+    ``lang`` must already be lower-case; the fence's info string is compared
+    case-insensitively.
+
     Examples
     --------
     >>> from markdown_it import MarkdownIt
-    >>> md = '''```toml
+    >>> md = '''```TOML title="Cargo.toml"
     ... ```'''
     >>> tok = MarkdownIt("commonmark").parse(md)[0]
     >>> _is_matching_fence_token(tok, 'toml')
     True
+    >>> bare = MarkdownIt("commonmark").parse("```\\n```")[0]
+    >>> _is_matching_fence_token(bare, 'toml')
+    False
     """
     if tok.type != "fence":
         return False
-    info_lang = ((tok.info or "").split()[0] or "").lower()
-    return info_lang == lang.lower()
+    words = (tok.info or "").split(None, 1)
+    return bool(words) and words[0].lower() == lang
 
 
 def _extract_fence_indent(opening_line: str, fence_marker: str) -> str:
@@ -59,9 +143,31 @@ def _extract_fence_indent(opening_line: str, fence_marker: str) -> str:
     return "" if pos < 0 else opening_line[:pos]
 
 
+def _line_offsets(text: str) -> list[int]:
+    """Return the start offset of each line in ``text`` plus its length.
+
+    Entry ``n`` is where line ``n`` begins, so the slice between two entries
+    is a run of whole lines.
+
+    Examples
+    --------
+    >>> _line_offsets('a\\nbc\\n')
+    [0, 2, 5]
+    >>> _line_offsets('a\\nbc')
+    [0, 2, 4]
+    >>> _line_offsets('a\\r\\nb\\rc')
+    [0, 3, 5, 6]
+    """
+    offsets = [0]
+    offsets.extend(match.end() for match in _LINE_BREAK_RE.finditer(text))
+    if offsets[-1] != len(text):
+        offsets.append(len(text))
+    return offsets
+
+
 def _process_fence_token(
     tok,
-    lines: list[str],
+    opening_line: str,
     lang: str,
     replace_fn: Callable[[str], str],
 ) -> str:
@@ -74,24 +180,28 @@ def _process_fence_token(
     ... ```
     ... '''
     >>> tokens = MarkdownIt('commonmark').parse(md)
-    >>> result = _process_fence_token(
-    ...     tokens[0], md.splitlines(keepends=True), 'toml', str.upper
-    ... )
+    >>> result = _process_fence_token(tokens[0], '```toml\\n', 'toml', str.upper)
     >>> result == '```toml\\nFOO\\n```\\n'
     True
+    >>> md = '- x\\n\\n  ```toml\\n  a\\n\\n  b\\n  ```\\n'
+    >>> nested = MarkdownIt('commonmark').parse(md)
+    >>> fence = next(t for t in nested if t.type == 'fence')
+    >>> _process_fence_token(fence, '  ```toml\\n', 'toml', str.upper)
+    '  ```toml\\n  A\\n  \\n  B\\n  ```\\n'
     """
-    start, _ = tok.map
     fence_marker = tok.markup or "```"
-    indent = _extract_fence_indent(lines[start], fence_marker)
+    indent = _extract_fence_indent(opening_line, fence_marker)
     info = tok.info or lang
     original_body = tok.content
     new_body = replace_fn(original_body)
-    m = re.search(r"(\r?\n+)$", original_body)
+    m = _FENCE_TRAIL_NL_RE.search(original_body)
     suffix = m.group(1) if m else ""
     new_body = new_body.rstrip("\r\n") + suffix
-    indented = "".join(
-        f"{indent}{line}" for line in new_body.splitlines(keepends=True)
-    )
+    indented = new_body
+    if indent and new_body:
+        indented = indent + new_body.replace("\n", "\n" + indent)
+        if new_body.endswith("\n"):
+            indented = indented[: -len(indent)]
     return f"{indent}{fence_marker}{info}\n{indented}{indent}{fence_marker}\n"
 
 
@@ -118,39 +228,85 @@ def replace_fences(md_text: str, lang: str, replace_fn: Callable[[str], str]) ->
     >>> replaced == '```toml\\n[dependencies]\\nfoo = "2"\\n```\\n'
     True
     """
-    md = MarkdownIt("commonmark")
-    tokens = md.parse(md_text)
-    lines = md_text.splitlines(keepends=True)
+    lang = lang.lower()
+    tokens = _MD_PARSER.parse(md_text)
+    offsets = _line_offsets(md_text)
     out: list[str] = []
     last = 0
     for tok in tokens:
         if not _is_matching_fence_token(tok, lang):
             continue
         start, end = tok.map
-        out.append("".join(lines[last:start]))
-        out.append(_process_fence_token(tok, lines, lang, replace_fn))
+        opening_line = md_text[offsets[start] : offsets[start + 1]]
+        out.append(md_text[offsets[last] : offsets[start]])
+        out.append(_process_fence_token(tok, opening_line, lang, replace_fn))
         last = end
-    out.append("".join(lines[last:]))
+    out.append(md_text[offsets[last] :])
     return "".join(out)
 
 
+class ManifestKind(enum.Enum):
+    """Shape of a ``Cargo.toml`` whose version is being bumped."""
+
+    WORKSPACE_ROOT = enum.auto()
+    PACKAGE = enum.auto()
+
+
+def _package_table(
+    doc: MutableMapping[str, object],
+    kind: ManifestKind,
+) -> MutableMapping[str, object] | None:
+    """Return the table holding the version for a manifest of ``kind``.
+
+    The workspace root prefers ``[workspace.package]`` and falls back to a
+    root ``[package]``; members only ever carry ``[package]``.
+
+    Examples
+    --------
+    >>> doc = {"workspace": {"package": {"version": "0"}}, "package": {}}
+    >>> _package_table(doc, ManifestKind.WORKSPACE_ROOT)
+    {'version': '0'}
+    >>> _package_table(doc, ManifestKind.PACKAGE)
+    {}
+    """
+    if kind is ManifestKind.WORKSPACE_ROOT:
+        workspace = doc.get("workspace")
+        if workspace and "package" in workspace:
+            return workspace["package"]
+    return doc.get("package")
+
+
 def _update_package_version(
     doc: MutableMapping[str, object],
     version: str,
-) -> None:
+    kind: ManifestKind = ManifestKind.PACKAGE,
+) -> bool:
     """Update package version in ``doc`` if present.
 
+    Versions inherited with ``version.workspace = true`` are left alone, as
+    they follow the workspace root. Returns ``True`` if the stored version
+    changed.
+
     Examples
     --------
     >>> data = {"package": {"version": "0"}}
     >>> _update_package_version(data, "1")
+    True
     >>> data["package"]["version"]
     '1'
+    >>> _update_package_version(data, "1")
+    False
+    >>> _update_package_version({"package": {"version": {"workspace": True}}}, "1")
+    False
     """
-    if "workspace" in doc and "package" in doc["workspace"]:
-        doc["workspace"]["package"]["version"] = version
-    elif "package" in doc:
-        doc["package"]["version"] = version
+    package = _package_table(doc, kind)
+    if package is None:
+        return False
+    current = package.get("version")
+    if current == version or isinstance(current, Mapping):
+        return False
+    package["version"] = version
+    return True
 
 
 def _extract_version_prefix(
@@ -166,39 +322,70 @@ def _extract_version_prefix(
     '^'
     >>> _extract_version_prefix("1")
     ''
+    >>> _extract_version_prefix({"version": "~1"})
+    '~'
+    >>> _extract_version_prefix(None)
+    ''
     """
     if isinstance(entry, Mapping):
         entry = entry.get("version")
-    text = entry.value if isinstance(entry, tomlkit.items.String) else str(entry or "")
-    return text[0] if text and text[0] in "^~" else ""
+    # ``tomlkit.items.String`` subclasses ``str``, so no unwrapping is needed.
+    prefix = str(entry or "")[:1]
+    return prefix if prefix in ("^", "~") else ""
+
+
+def _restyled_string(
+    template: tomlkit.items.String,
+    text: str,
+) -> tomlkit.items.String:
+    """Return ``text`` as a TOML string styled like ``template``.
+
+    The quote style and trivia (comments and whitespace) of ``template`` are
+    reused, so the value and its rendering stay consistent. Version strings
+    never contain characters that need escaping.
+
+    Examples
+    --------
+    >>> import tomlkit
+    >>> doc = tomlkit.parse("foo = '0.1'  # pinned")
+    >>> doc["foo"] = _restyled_string(doc["foo"], "1.2.3")
+    >>> tomlkit.dumps(doc), doc["foo"]
+    ("foo = '1.2.3'  # pinned", '1.2.3')
+    """
+    return tomlkit.items.String(template.type, text, text, template.trivia)
 
 
 def _update_dict_dependency(
     entry: MutableMapping[str, object],
     version: str,
-) -> None:
+) -> bool:
     """Update dict-style dependency ``entry`` with ``version``.
 
+    Returns ``True`` if the entry changed.
+
     Examples
     --------
     >>> import tomlkit
     >>> entry = tomlkit.table()
     >>> entry["version"] = tomlkit.string("^0.1")
     >>> _update_dict_dependency(entry, "1.2.3")
+    True
     >>> tomlkit.dumps(entry).strip()
     'version = "^1.2.3"'
+    >>> _update_dict_dependency(entry, "1.2.3")
+    False
     """
     if bool(entry.get("workspace")) is True:
-        return
-    prefix = _extract_version_prefix(entry)
+        return False
     existing = entry.get("version")
+    updated = _extract_version_prefix(existing) + version
+    if existing == updated:
+        return False
     if isinstance(existing, tomlkit.items.String):
-        try:
-            setattr(existing, "value", prefix + version)
-        except AttributeError:  # tomlkit <0.14 lacks a value setter
-            existing._original = prefix + version
+        entry["version"] = _restyled_string(existing, updated)
     else:
-        entry["version"] = prefix + version
+        entry["version"] = updated
+    return True
 
 
 def _update_string_dependency(
@@ -206,64 +393,75 @@ def _update_string_dependency(
     dependency: str,
     entry: tomlkit.items.String | str,
     version: str,
-) -> None:
+) -> bool:
     """Update string-style dependency ``dependency`` in ``deps``.
 
+    Returns ``True`` if the entry changed.
+
     Examples
     --------
     >>> import tomlkit
     >>> doc = tomlkit.parse('foo = "^0.1"')
     >>> _update_string_dependency(doc, 'foo', doc['foo'], '1.2.3')
+    True
     >>> tomlkit.dumps(doc).strip()
     'foo = "^1.2.3"'
+    >>> _update_string_dependency(doc, 'foo', doc['foo'], '1.2.3')
+    False
     """
-    prefix = _extract_version_prefix(entry)
+    updated = _extract_version_prefix(entry) + version
+    if entry == updated:
+        return False
     if isinstance(entry, tomlkit.items.String):
-        try:
-            setattr(entry, "value", prefix + version)
-        except AttributeError:  # tomlkit <0.14 lacks a value setter
-            entry._original = prefix + version
+        deps[dependency] = _restyled_string(entry, updated)
     else:
-        deps[dependency] = prefix + version
+        deps[dependency] = updated
+    return True
 
 
 def _update_dependency_in_table(
     deps: MutableMapping[str, object],
     dependency: str,
     version: str,
-) -> None:
+) -> bool:
     """Update ``dependency`` inside dependency table ``deps``.
 
+    Returns ``True`` if the entry changed.
+
     Examples
     --------
     >>> import tomlkit
     >>> doc = tomlkit.parse('''[dependencies]
     ... foo = "^0.1"''')
     >>> _update_dependency_in_table(doc['dependencies'], 'foo', '1.2.3')
+    True
     >>> 'foo = "^1.2.3"' in tomlkit.dumps(doc)
     True
     """
     entry = deps[dependency]
     if isinstance(entry, Mapping):
-        _update_dict_dependency(entry, version)
-    else:
-        _update_string_dependency(deps, dependency, entry, version)
+        return _update_dict_dependency(entry, version)
+    return _update_string_dependency(deps, dependency, entry, version)
 
 
 def _update_dependency_version(
     doc: MutableMapping[str, object],
     dependency: str,
     version: str,
-) -> None:
+) -> bool:
     """Update ``dependency`` across dependency tables in ``doc``.
 
-    Maintains caret or tilde prefixes and preserves formatting.
+    Maintains caret or tilde prefixes and preserves formatting. Returns
+    ``True`` if any entry changed.
 
     Examples
     --------
     >>> doc = tomlkit.parse('''[dependencies]
     ... foo = "^0.1"''')
     >>> _update_dependency_version(doc, 'foo', '1.2.3')
+    True
+    >>> _update_dependency_version(doc, 'foo', '1.2.3')
+    False
     >>> tomlkit.dumps(doc).strip() == '''[dependencies]
     ... foo = "^1.2.3"'''
     True
@@ -272,20 +470,232 @@ def _update_dependency_version(
     ... foo = { version = "~0.1", features = ["a"] }'''
     >>> doc = tomlkit.parse(snippet)
     >>> _update_dependency_version(doc, 'foo', '1.2.3')
+    True
     >>> 'version = "~1.2.3"' in tomlkit.dumps(doc)
     True
 
     >>> doc = tomlkit.parse('''[dev-dependencies]
     ... foo = "^0.1"''')
     >>> _update_dependency_version(doc, 'foo', '1.2.3')
+    True
     >>> 'foo = "^1.2.3"' in tomlkit.dumps(doc)
     True
     """
-    for table in ("dependencies", "dev-dependencies", "build-dependencies"):
+    changed = False
+    for table in _DEPENDENCY_TABLES:
         deps = doc.get(table)
         if not deps or dependency not in deps:
             continue
-        _update_dependency_in_table(deps, dependency, version)
+        if _update_dependency_in_table(deps, dependency, version):
+            changed = True
+    return changed
+
+
+def _apply_version(
+    doc: MutableMapping[str, object],
+    version: str,
+    dependency: str | None = None,
+    kind: ManifestKind = ManifestKind.PACKAGE,
+) -> bool:
+    """Apply ``version`` to the package and optional ``dependency`` in ``doc``.
+
+    Returns ``True`` if ``doc`` changed and needs writing back.
+
+    Examples
+    --------
+    >>> doc = tomlkit.parse('''[package]
+    ... version = "0"
+    ... [dependencies]
+    ... foo = "^0"''')
+    >>> _apply_version(doc, "1", "foo")
+    True
+    >>> print(tomlkit.dumps(doc))
+    [package]
+    version = "1"
+    [dependencies]
+    foo = "^1"
+    >>> _apply_version(doc, "1")
+    False
+    """
+    changed = _update_package_version(doc, version, kind)
+
+    if dependency and _update_dependency_version(doc, dependency, version):
+        changed = True
+    return changed
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    """Atomically replace ``path`` with ``text``.
+
+    The temporary file is a sibling of ``path`` named after the process ID,
+    which keeps it on the same filesystem for ``os.replace``. ``text`` is
+    encoded once and written as raw bytes, translating newlines to the
+    platform convention as text-mode writes did.
+
+    The temporary file is deliberately not ``fsync``-ed before the rename.
+    Readers never observe a partial manifest, but a power loss straight after
+    a bump may leave the old contents; rerunning the bump is the recovery,
+    which is an acceptable trade for a developer tool.
+
+    Parameters
+    ----------
+    path
+        File to replace.
+    text
+        New file contents.
+    """
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    data = memoryview(text.encode("utf-8"))
+    temp_path = path.with_name(f"{path.name}.tmp.{os.getpid()}")
+    # O_BINARY stops the Windows C runtime translating newlines a second time.
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    fd = os.open(temp_path, flags, 0o644)
+    try:
+        try:
+            while data:
+                data = data[os.write(fd, data) :]
+        finally:
+            os.close(fd)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_doc(
+    toml_path: Path,
+    doc: MutableMapping[str, object],
+    original_text: str | None = None,
+) -> None:
+    """Atomically replace ``toml_path`` with the serialised ``doc``.
+
+    Parameters
+    ----------
+    toml_path
+        Path to the ``Cargo.toml`` file.
+    doc
+        Document to serialise.
+    original_text
+        Text ``doc`` was parsed from. When the serialised document matches it
+        byte for byte, the file is left untouched.
+    """
+    text = tomlkit.dumps(doc)
+    if text != original_text:
+        _atomic_write_text(toml_path, text)
+
+
+def _splice_dependency_version(text: str, dependency: str, version: str) -> str | None:
+    """Rewrite single-line ``dependency`` entries in ``text``.
+
+    Returns ``None`` when an entry is not in a top-level dependency table,
+    inherits from the workspace, or the name is mentioned anywhere other than
+    on an entry line (a ``[dependencies.name]`` table, a multi-line inline
+    table, a comment), or when there is no entry at all, so the caller can
+    fall back to a full TOML round-trip.
+
+    Examples
+    --------
+    >>> _splice_dependency_version(
+    ...     '[dependencies]\\northo_config = { version = "^0", features = ["a"] }\\n',
+    ...     "ortho_config",
+    ...     "1",
+    ... )
+    '[dependencies]\\northo_config = { version = "^1", features = ["a"] }\\n'
+    >>> _splice_dependency_version(
+    ...     '[dependencies.ortho_config]\\nversion = "0"\\n', "ortho_config", "1"
+    ... ) is None
+    True
+    """
+    entry_re, mention_re = _DEPENDENCY_SPLICE_RES[dependency]
+    pieces: list[str] = []
+    last = 0
+    scanned = 0
+    for match in entry_re.finditer(text):
+        if mention_re.search(text, scanned, match.start()):
+            return None
+        headers = _TABLE_HEADER_RE.findall(text, 0, match.start())
+        if not headers or headers[-1] not in _DEPENDENCY_TABLES:
+            return None
+        line_end = text.find("\n", match.end())
+        scanned = len(text) if line_end < 0 else line_end
+        if "workspace" in text[match.start() : scanned]:
+            return None
+        pieces.append(text[last : match.end(1)])
+        pieces.append(version)
+        last = match.start(2)
+    if not pieces or mention_re.search(text, scanned):
+        return None
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+
+def _fast_set_package_version(
+    text: str,
+    version: str,
+    kind: ManifestKind = ManifestKind.PACKAGE,
+) -> str | None:
+    """Splice ``version`` into the package table of ``text``.
+
+    Members are edited in ``[package]``; the workspace root in
+    ``[workspace.package]``. Only the plain ``version = "..."`` form is
+    handled, and a package that needs a dependency sync only when that
+    dependency can be spliced too. ``None`` signals that the caller must fall
+    back to a full TOML round-trip, as it also does whenever the manifest
+    holds a multi-line string, whose lines the splice cannot tell from keys.
+
+    Examples
+    --------
+    >>> _fast_set_package_version(
+    ...     '[workspace.package]\\nversion = "0.1.0"\\n',
+    ...     "1.2.3",
+    ...     ManifestKind.WORKSPACE_ROOT,
+    ... )
+    '[workspace.package]\\nversion = "1.2.3"\\n'
+    >>> _fast_set_package_version(
+    ...     '[package]\\nname = "demo"\\nversion = "0.1.0"\\n', "1.2.3"
+    ... )
+    '[package]\\nname = "demo"\\nversion = "1.2.3"\\n'
+    >>> _fast_set_package_version(
+    ...     '[package]\\nname = "demo"\\nversion.workspace = true\\n', "1.2.3"
+    ... ) is None
+    True
+    >>> print(_fast_set_package_version(
+    ...     '[package]\\nname = "ortho_config"\\nversion = "0.1.0"\\n\\n'
+    ...     '[dependencies]\\northo_config_macros = { version = "0.1.0" }\\n',
+    ...     "1.2.3",
+    ... ))
+    [package]
+    name = "ortho_config"
+    version = "1.2.3"
+    <BLANKLINE>
+    [dependencies]
+    ortho_config_macros = { version = "1.2.3" }
+    <BLANKLINE>
+    """
+    if '"""' in text or "'''" in text:
+        return None
+    if kind is ManifestKind.WORKSPACE_ROOT:
+        sections = list(_WORKSPACE_PACKAGE_SECTION_RE.finditer(text))
+    else:
+        sections = list(_PACKAGE_SECTION_RE.finditer(text))
+    if len(sections) != 1:
+        return None
+    start, end = sections[0].span(1)
+    dependency = None
+    if kind is ManifestKind.PACKAGE:
+        names = _PACKAGE_NAME_RE.findall(text, start, end)
+        if len(names) != 1:
+            return None
+        dependency = _DEPENDENCY_SYNC.get(names[0])
+    versions = list(_PACKAGE_VERSION_RE.finditer(text, start, end))
+    if len(versions) != 1:
+        return None
+    match = versions[0]
+    updated = f"{text[: match.end(1)]}{version}{text[match.start(2) :]}"
+    if dependency is None:
+        return updated
+    return _splice_dependency_version(updated, dependency, version)
 
 
 def _set_version(
@@ -293,9 +703,14 @@ def _set_version(
     version: str,
     dependency: str | None = None,
     doc: MutableMapping[str, object] | None = None,
+    original_text: str | None = None,
 ) -> None:
     """Set package and optional dependency version in a ``Cargo.toml``.
 
+    The file is left untouched when the package version is already current
+    and no dependency sync was requested, or when the rewritten document
+    serialises to the original text.
+
     Parameters
     ----------
     toml_path
@@ -306,24 +721,41 @@ def _set_version(
         Optional dependency to update alongside the package version.
     doc
         Pre-parsed document to update. If provided, the file is not re-read.
+    original_text
+        Text ``doc`` was parsed from, used to detect no-op rewrites.
     """
     if doc is None:
-        with toml_path.open("r", encoding="utf-8") as fh:
-            doc = tomlkit.parse(fh.read())
+        original_text = toml_path.read_text(encoding="utf-8")
+        doc = tomlkit.parse(original_text)
 
-    _update_package_version(doc, version)
+    if _apply_version(doc, version, dependency):
+        _write_doc(toml_path, doc, original_text)
 
-    if dependency:
-        _update_dependency_version(doc, dependency, version)
 
-    text = tomlkit.dumps(doc)
-    temp_dir = toml_path.parent
-    with tempfile.NamedTemporaryFile(
-        "w", encoding="utf-8", dir=temp_dir, delete=False
-    ) as tf:
-        tf.write(text)
-        temp_name = tf.name
-    os.replace(temp_name, toml_path)
+def _set_workspace_version(workspace: Path, text: str, version: str) -> None:
+    """Write ``version`` into the workspace root manifest ``workspace``.
+
+    ``text`` is the manifest's current contents. A plain
+    ``[workspace.package]`` version is spliced in directly; any other layout
+    goes through tomlkit.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp:
+    ...     manifest = Path(tmp) / "Cargo.toml"
+    ...     text = '[workspace]\\nmembers = []\\n[workspace.package]\\nversion = "0"\\n'
+    ...     _set_workspace_version(manifest, text, "1")
+    ...     manifest.read_text().endswith('version = "1"\\n')
+    True
+    """
+    updated = _fast_set_package_version(text, version, ManifestKind.WORKSPACE_ROOT)
+    if updated is not None:
+        _atomic_write_text(workspace, updated)
+        return
+    data = tomlkit.parse(text)
+    if _apply_version(data, version, kind=ManifestKind.WORKSPACE_ROOT):
+        _write_doc(workspace, data, text)
 
 
 def _validate_args_and_setup(argv: list[str]) -> tuple[str, Path] | None:
@@ -355,9 +787,71 @@ def _validate_args_and_setup(argv: list[str]) -> tuple[str, Path] | None:
     return version, root
 
 
+def _list_directory(directory: Path, listings: dict[Path, list[str]]) -> list[str]:
+    """Return entry names in ``directory``, scanning it at most once.
+
+    Examples
+    --------
+    >>> listings = {}
+    >>> 'bump_version.py' in _list_directory(Path('scripts'), listings)
+    True
+    >>> list(listings) == [Path('scripts')]
+    True
+    """
+    names = listings.get(directory)
+    if names is None:
+        try:
+            with os.scandir(directory) as entries:
+                names = [entry.name for entry in entries]
+        except OSError:
+            names = []
+        listings[directory] = names
+    return names
+
+
+def _match_member_pattern(
+    root: Path,
+    pattern: str,
+    listings: dict[Path, list[str]],
+) -> list[Path]:
+    """Return paths under ``root`` matching the workspace member ``pattern``.
+
+    Literal patterns resolve with a single ``stat``. Patterns whose wildcards
+    are confined to the final component are matched against a shared,
+    per-directory listing; anything else, including a recursive ``**``, falls
+    back to ``Path.glob``.
+
+    Examples
+    --------
+    >>> [p.as_posix() for p in _match_member_pattern(Path('.'), 'scrip*', {})]
+    ['scripts']
+    >>> listings = {}
+    >>> [p.as_posix() for p in _match_member_pattern(Path('.'), 'scripts', listings)]
+    ['scripts']
+    >>> listings
+    {}
+    """
+    if _GLOB_MAGIC.search(pattern) is None:
+        candidate = root / pattern
+        return [candidate] if candidate.exists() else []
+    pure = PurePosixPath(pattern)
+    parent = pure.parent.as_posix()
+    if not pure.name or "**" in pure.name or _GLOB_MAGIC.search(parent):
+        return list(root.glob(pattern))
+    directory = root / parent
+    return [
+        directory / name
+        for name in _list_directory(directory, listings)
+        if fnmatch.fnmatchcase(name, pure.name)
+    ]
+
+
 def _resolve_member_paths(root: Path, members: list[str]) -> list[Path]:
     """Expand workspace member patterns to concrete paths.
 
+    Each parent directory referenced by the patterns is scanned once, and
+    paths matched by several patterns are reported only once.
+
     Parameters
     ----------
     root
@@ -368,17 +862,22 @@ def _resolve_member_paths(root: Path, members: list[str]) -> list[Path]:
     Returns
     -------
     list[Path]
-        Paths matched by the supplied patterns. Warnings are emitted for
-        patterns that match nothing.
+        Paths matched by the supplied patterns, in first-match order.
+        Warnings are emitted for patterns that match nothing.
 
     Examples
     --------
     >>> [path.as_posix() for path in _resolve_member_paths(Path('.'), ['scripts'])]
     ['scripts']
+    >>> [path.as_posix() for path in _resolve_member_paths(
+    ...     Path('.'), ['scripts', 'scrip*']
+    ... )]
+    ['scripts']
     """
+    listings: dict[Path, list[str]] = {}
     paths: list[Path] = []
     for pattern in members:
-        matches = list(root.glob(pattern))
+        matches = _match_member_pattern(root, pattern, listings)
         if not matches:
             print(
                 f"Warning: No members matched pattern '{pattern}'",
@@ -386,7 +885,7 @@ def _resolve_member_paths(root: Path, members: list[str]) -> list[Path]:
             )
             continue
         paths.extend(matches)
-    return paths
+    return list(dict.fromkeys(paths))
 
 
 def _update_member_version(member_path: Path, version: str) -> bool:
@@ -420,22 +919,28 @@ def _update_member_version(member_path: Path, version: str) -> bool:
     ('[package]\\nname = "demo"\\nversion = "1.2.3"\\n', False)
     """
     try:
+        text = member_path.read_text(encoding="utf-8")
+        updated = _fast_set_package_version(text, version)
+        if updated is not None:
+            if updated != text:
+                _atomic_write_text(member_path, updated)
+            return False
+        # Probe with the stdlib parser and only build a format-preserving
+        # tomlkit document when something must actually be rewritten.
+        package = tomllib.loads(text).get("package", {})
         # Derive from the actual package name to avoid coupling to directory names
-        with member_path.open("r", encoding="utf-8") as fh:
-            doc = tomlkit.parse(fh.read())
-        package_name = doc.get("package", {}).get("name")
-        dep = "ortho_config_macros" if package_name == "ortho_config" else None
-        _set_version(member_path, version, dep, doc)
+        dep = _DEPENDENCY_SYNC.get(package.get("name"))
+        current = package.get("version")
+        if dep is None and (current == version or isinstance(current, Mapping)):
+            return False
+        _set_version(member_path, version, dep, tomlkit.parse(text), text)
     except (
         TOMLKitError,
+        tomllib.TOMLDecodeError,
         OSError,
-        TypeError,
-        ValueError,
+        UnicodeDecodeError,
     ) as exc:  # pragma: no cover - defensive
-        print(
-            f"Error: Failed to set version for {member_path}: {exc}",
-            file=sys.stderr,
-        )
+        _report(f"Error: Failed to set version for {member_path}: {exc}")
         return True
     return False
 
@@ -463,18 +968,27 @@ def _process_single_member(member_root: Path, version: str) -> bool:
     member_path = (
         member_root / "Cargo.toml" if member_root.is_dir() else member_root
     )
-    if not member_path.exists():
-        print(
-            f"Warning: Skipping missing member Cargo.toml at {member_path}",
-            file=sys.stderr,
-        )
+    try:
+        mode = member_path.stat().st_mode
+    except FileNotFoundError:
+        _report(f"Warning: Skipping missing member Cargo.toml at {member_path}")
         return False
+    except OSError as exc:
+        _report(f"Error: Failed to stat {member_path}: {exc}")
+        return True
+    if not stat.S_ISREG(mode):
+        _report(f"Error: {member_path} is not a regular file")
+        return True
     return _update_member_version(member_path, version)
 
 
 def _process_members(root: Path, members: list[str], version: str) -> bool:
     """Update all workspace members to the supplied version.
 
+    Members are independent files, so they are updated concurrently on a
+    thread pool to overlap their file I/O. Diagnostics from the workers go
+    through ``_report`` so they stay line-atomic.
+
     Parameters
     ----------
     root
@@ -494,11 +1008,14 @@ def _process_members(root: Path, members: list[str], version: str) -> bool:
     >>> _process_members(Path('.'), ['scripts'], '1.2.3')
     False
     """
-    had_error = False
-    for member_root in _resolve_member_paths(root, members):
-        if _process_single_member(member_root, version):
-            had_error = True
-    return had_error
+    paths = _resolve_member_paths(root, members)
+    if not paths:
+        return False
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+        results = list(
+            executor.map(lambda path: _process_single_member(path, version), paths)
+        )
+    return any(results)
 
 
 def replace_version_in_toml(snippet: str, version: str) -> str:
@@ -513,20 +1030,23 @@ def replace_version_in_toml(snippet: str, version: str) -> str:
     >>> replace_version_in_toml('''[dependencies]
     ... ortho_config = "0"''', '1') == '[dependencies]\\northo_config = "1"'
     True
+    >>> replace_version_in_toml('[package]\\nname = "ortho_config"\\n', '1')
+    '[package]\\nname = "ortho_config"\\n'
     """
+    # Every table we rewrite has "dependencies" in its header, so snippets
+    # lacking either substring cannot change and need no parse.
+    if "ortho_config" not in snippet or "dependencies" not in snippet:
+        return snippet
+    spliced = _splice_dependency_version(snippet, "ortho_config", version)
+    if spliced is not None:
+        return spliced
     try:
         doc = tomlkit.parse(snippet)
     except TOMLKitError:
         return snippet
-    match = re.search(r"((?:\r?\n)*)$", snippet)
+    match = _SNIPPET_TRAIL_NL_RE.search(snippet)
     newline_suffix = match.group(1) if match else ""
-    dependency_found = False
-    for table in ("dependencies", "dev-dependencies", "build-dependencies"):
-        deps = doc.get(table)
-        if deps and "ortho_config" in deps:
-            dependency_found = True
-            _update_dependency_in_table(deps, "ortho_config", version)
-    if not dependency_found:
+    if not _update_dependency_version(doc, "ortho_config", version):
         return snippet
     dumped = tomlkit.dumps(doc)
     base = dumped.rstrip("\r\n")
@@ -556,9 +1076,50 @@ def _update_markdown_versions(md_path: Path, version: str) -> None:
     """
     if not md_path.exists():
         return
-    text = md_path.read_text(encoding="utf-8")
+    raw = md_path.read_bytes()
+    if b"ortho_config" not in raw or not _TOML_FENCE_HINT_RE.search(raw):
+        return
+    # Mirror ``read_text``'s universal-newline translation so ``write_text``
+    # round-trips line endings exactly as before.
+    text = raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
     updated = replace_fences(text, "toml", lambda body: replace_version_in_toml(body, version))
-    md_path.write_text(updated, encoding="utf-8")
+    if updated != text:
+        md_path.write_text(updated, encoding="utf-8")
+
+
+def _update_documentation(root: Path, version: str) -> None:
+    """Update ``ortho_config`` snippets in the workspace documentation.
+
+    The documents are independent, so they are rewritten concurrently.
+    Failures are reported as warnings and do not abort the bump.
+
+    Parameters
+    ----------
+    root
+        Workspace root directory.
+    version
+        Semantic version to apply.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     _update_documentation(Path(tmpdir), '1')
+    """
+    md_paths = (root / "README.md", root / "docs" / "users-guide.md")
+    with ThreadPoolExecutor(max_workers=len(md_paths)) as executor:
+        futures = [
+            (md_path, executor.submit(_update_markdown_versions, md_path, version))
+            for md_path in md_paths
+        ]
+    for md_path, future in futures:
+        try:
+            future.result()
+        except (TOMLKitError, OSError, TypeError, ValueError) as exc:
+            print(
+                f"Warning: Failed to update {md_path}: {exc}",
+                file=sys.stderr,
+            )
 
 
 def main(argv: list[str]) -> int:
@@ -588,14 +1149,17 @@ def main(argv: list[str]) -> int:
     version, root = result
     workspace = root / "Cargo.toml"
     try:
-        with workspace.open("r", encoding="utf-8") as fh:
-            data = tomlkit.parse(fh.read())
-    except (TOMLKitError, OSError, TypeError, ValueError) as exc:  # pragma: no cover - defensive
+        text = workspace.read_text(encoding="utf-8")
+        probe = tomllib.loads(text)
+    except (OSError, ValueError) as exc:  # pragma: no cover - defensive
         print(f"Error: Failed to parse {workspace}: {exc}", file=sys.stderr)
         return 1
-    members = data.get("workspace", {}).get("members", [])
+    members = probe.get("workspace", {}).get("members", [])
     try:
-        _set_version(workspace, version, doc=data)
+        # ``probe`` is a throwaway plain dict, so updating it doubles as a cheap
+        # check for whether the format-preserving rewrite is needed at all.
+        if _update_package_version(probe, version, ManifestKind.WORKSPACE_ROOT):
+            _set_workspace_version(workspace, text, version)
     except (TOMLKitError, OSError, TypeError, ValueError) as exc:
         print(
             f"Error: Failed to set version for {workspace}: {exc}",
@@ -603,14 +1167,7 @@ def main(argv: list[str]) -> int:
         )
         return 1
     had_error = _process_members(root, members, version)
-    for md_path in (root / "README.md", root / "docs" / "users-guide.md"):
-        try:
-            _update_markdown_versions(md_path, version)
-        except (TOMLKitError, OSError, TypeError, ValueError) as exc:
-            print(
-                f"Warning: Failed to update {md_path}: {exc}",
-                file=sys.stderr,
-            )
+    _update_documentation(root, version)
     return 0 if not had_error else 1
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,11 +1,18 @@
+import os
 from pathlib import Path
 
 import pytest
 import tomlkit
 
 from scripts.bump_version import (
+    ManifestKind,
+    _atomic_write_text,
+    _fast_set_package_version,
+    _process_single_member,
+    _resolve_member_paths,
     _update_dependency_version,
     _update_markdown_versions,
+    _update_member_version,
     replace_fences,
     replace_version_in_toml,
 )
@@ -67,6 +74,142 @@ def test_workspace_dependency_no_version_written() -> None:
     assert 'version' not in deps, 'must not add version when workspace is true'
 
 
+def test_update_member_version_preserves_comments(tmp_path: Path) -> None:
+    cargo_toml = tmp_path / "Cargo.toml"
+    cargo_toml.write_text(
+        "[package]\n"
+        'name = "ortho_config"\n'
+        'version = "0.1.0"  # bumped by scripts/bump_version.py\n'
+        "\n"
+        "# Kept in lockstep with the macros crate.\n"
+        "[dependencies]\n"
+        'ortho_config_macros = { path = "../ortho_config_macros", version = "0.1.0" }\n'
+    )
+    assert _update_member_version(cargo_toml, "1.2.3") is False
+    updated = cargo_toml.read_text()
+    assert 'version = "1.2.3"  # bumped by scripts/bump_version.py' in updated
+    assert "# Kept in lockstep with the macros crate." in updated
+    assert 'path = "../ortho_config_macros", version = "1.2.3"' in updated
+
+
+def test_update_member_version_syncs_dependency_table(tmp_path: Path) -> None:
+    cargo_toml = tmp_path / "Cargo.toml"
+    cargo_toml.write_text(
+        '[package]\nname = "ortho_config"\nversion = "0.1.0"\n\n'
+        '[dependencies]\northo_config_macros = { version = "0.1.0" }\n\n'
+        '[dev-dependencies.ortho_config_macros]\nversion = "~0.1.0"\n'
+    )
+    assert _update_member_version(cargo_toml, "1.2.3") is False
+    updated = cargo_toml.read_text()
+    assert 'ortho_config_macros = { version = "1.2.3" }' in updated
+    assert 'version = "~1.2.3"' in updated
+
+
+def test_update_member_version_leaves_no_temporary_files(tmp_path: Path) -> None:
+    cargo_toml = tmp_path / "Cargo.toml"
+    cargo_toml.write_text('[package]\nname = "demo"\nversion = "0.1.0"\n')
+    assert _update_member_version(cargo_toml, "1.2.3") is False
+    assert [path.name for path in tmp_path.iterdir()] == ["Cargo.toml"]
+
+
+def test_atomic_write_text_writes_platform_line_endings_once(tmp_path: Path) -> None:
+    target = tmp_path / "Cargo.toml"
+    target.write_bytes(b"stale\n")
+    _atomic_write_text(target, '[package]\nname = "demo"\n\nversion = "1.2.3"\n')
+    expected = f'[package]{os.linesep}name = "demo"{os.linesep}{os.linesep}'
+    expected += f'version = "1.2.3"{os.linesep}'
+    assert target.read_bytes() == expected.encode("utf-8")
+
+
+def test_update_member_version_keeps_workspace_inherited_version(
+    tmp_path: Path,
+) -> None:
+    manifest = '[package]\nname = "demo"\nversion.workspace = true\nedition = "2024"\n'
+    cargo_toml = tmp_path / "Cargo.toml"
+    cargo_toml.write_text(manifest)
+    assert _update_member_version(cargo_toml, "1.2.3") is False
+    assert cargo_toml.read_text() == manifest, "must keep inheriting the version"
+
+
+def test_update_member_version_leaves_multiline_strings_alone(
+    tmp_path: Path,
+) -> None:
+    manifest = (
+        '[package]\nname = "demo"\ndescription = """\nversion = "7"\n"""\n'
+        "version.workspace = true\n"
+    )
+    cargo_toml = tmp_path / "Cargo.toml"
+    cargo_toml.write_text(manifest)
+    assert _update_member_version(cargo_toml, "1.2.3") is False
+    assert cargo_toml.read_text() == manifest, "must not edit string contents"
+
+
+def test_fast_set_workspace_version_defers_on_multiline_strings() -> None:
+    manifest = (
+        "[workspace.package]\nedition = \"2024\"\n"
+        "description = '''\nversion = \"7\"\n'''\n"
+    )
+    fast = _fast_set_package_version(manifest, "1.2.3", ManifestKind.WORKSPACE_ROOT)
+    assert fast is None, "must leave multi-line strings to tomlkit"
+
+
+def test_update_member_version_skips_write_when_current(tmp_path: Path) -> None:
+    cargo_toml = tmp_path / "Cargo.toml"
+    cargo_toml.write_text('[package]\nname = "demo"\nversion = "1.2.3"\n')
+    inode = cargo_toml.stat().st_ino
+    assert _update_member_version(cargo_toml, "1.2.3") is False
+    assert cargo_toml.stat().st_ino == inode, "must not replace an up-to-date file"
+
+
+def test_update_member_version_skips_write_when_dependency_current(
+    tmp_path: Path,
+) -> None:
+    cargo_toml = tmp_path / "Cargo.toml"
+    cargo_toml.write_text(
+        '[package]\nname = "ortho_config"\nversion = "1.2.3"\n\n'
+        '[dependencies]\northo_config_macros = { version = "1.2.3" }\n'
+    )
+    inode = cargo_toml.stat().st_ino
+    assert _update_member_version(cargo_toml, "1.2.3") is False
+    assert cargo_toml.stat().st_ino == inode, "must not replace an up-to-date file"
+
+
+def test_process_single_member_rejects_non_regular_manifest(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    (tmp_path / "Cargo.toml").mkdir()
+    assert _process_single_member(tmp_path, "1.2.3") is True
+    assert "is not a regular file" in capsys.readouterr().err
+
+
+def test_process_single_member_skips_missing_manifest(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert _process_single_member(tmp_path, "1.2.3") is False
+    assert "Skipping missing member Cargo.toml" in capsys.readouterr().err
+
+
+def test_resolve_member_paths_deduplicates_overlapping_patterns(
+    tmp_path: Path,
+) -> None:
+    for name in ("alpha", "beta"):
+        (tmp_path / "crates" / name).mkdir(parents=True)
+    resolved = _resolve_member_paths(tmp_path, ["crates/*", "crates/alpha"])
+    assert sorted(path.name for path in resolved) == ["alpha", "beta"]
+
+
+def test_resolve_member_paths_recurses_for_double_star(tmp_path: Path) -> None:
+    for rel in ("packages/a/sub", "packages/b"):
+        (tmp_path / rel).mkdir(parents=True)
+    resolved = _resolve_member_paths(tmp_path, ["packages/**"])
+    assert sorted(path.relative_to(tmp_path).as_posix() for path in resolved) == [
+        "packages",
+        "packages/a",
+        "packages/a/sub",
+        "packages/b",
+    ]
+
+
 @pytest.mark.parametrize(
     "md_text, should_change, description",
     [
@@ -108,6 +251,29 @@ def test_update_markdown_versions_behavior(
             assert updated == md_text, description
 
 
+def test_update_markdown_skips_files_without_ortho_config(tmp_path: Path) -> None:
+    md_bytes = b"```toml\r\n[dependencies]\r\nfoo = \"0\"\r\n```\r\n"
+    md_path = tmp_path / "README.md"
+    md_path.write_bytes(md_bytes)
+
+    _update_markdown_versions(md_path, "1")
+
+    assert md_path.read_bytes() == md_bytes, "must not rewrite unrelated documents"
+
+
+def test_update_markdown_skips_files_without_toml_fences(tmp_path: Path) -> None:
+    md_bytes = (
+        b"Add `ortho_config` to your manifest.\r\n\r\n"
+        b"```rust\r\nuse ortho_config;\r\n```\r\n"
+    )
+    md_path = tmp_path / "README.md"
+    md_path.write_bytes(md_bytes)
+
+    _update_markdown_versions(md_path, "1")
+
+    assert md_path.read_bytes() == md_bytes, "must skip documents without TOML fences"
+
+
 def test_update_markdown_preserves_trailing_newline(tmp_path: Path) -> None:
     md_text = """```toml
 [dependencies]
@@ -181,3 +347,15 @@ def test_replace_fences_preserves_indentation() -> None:
     ```
 """
     assert replaced == expected
+
+
+def test_replace_fences_ignores_fences_without_info_string() -> None:
+    md_text = "```\nplain\n```\n\n```toml\nfoo = \"0\"\n```\n"
+    replaced = replace_fences(md_text, "toml", lambda body: body.replace("0", "1"))
+    assert replaced == "```\nplain\n```\n\n```toml\nfoo = \"1\"\n```\n"
+
+
+def test_replace_fences_handles_carriage_return_line_breaks() -> None:
+    md_text = "intro\r\r```toml\rfoo = \"0\"\r```\rafter\r\n"
+    replaced = replace_fences(md_text, "toml", lambda body: body.replace("0", "1"))
+    assert replaced == "intro\r\r```toml\nfoo = \"1\"\n```\nafter\r\n"